@@ -1,16 +1,20 @@
 const { spawn } = require('child_process');
 const path = require('path');
 const { EventEmitter } = require('events');
+const { StringDecoder } = require('string_decoder');
 
 class PythonSpeechService extends EventEmitter {
   constructor() {
     super();
     this.pythonProcess = null;
+    this.audioChannel = null;
     this.isReady = false;
     this.requestQueue = [];
     this.pendingRequests = new Map();
     this.requestId = 0;
     this.maxQueueSize = 10;
+    this.stdoutBuffer = '';
+    this.stdoutDecoder = new StringDecoder('utf8');
     this.logs = {
       errors: [],
       info: []
@@ -19,10 +23,13 @@ class PythonSpeechService extends EventEmitter {
 
   reset() {
     this.pythonProcess = null;
+    this.audioChannel = null;
     this.isReady = false;
     this.requestQueue = [];
     this.pendingRequests.clear();
     this.requestId = 0;
+    this.stdoutBuffer = '';
+    this.stdoutDecoder = new StringDecoder('utf8');
     this.logs = {
       errors: [],
       info: []
@@ -37,9 +44,14 @@ class PythonSpeechService extends EventEmitter {
     try {
       const pythonScriptPath = path.join(__dirname, '../python/local_speech_service.py');
       
+      // fd 3 carries raw audio frames so recognition audio skips base64
       this.pythonProcess = spawn('python3', [pythonScriptPath], {
-        stdio: ['pipe', 'pipe', 'pipe']
+        stdio: ['pipe', 'pipe', 'pipe', 'pipe'],
+        env: { ...process.env, SPEECH_AUDIO_FD: '3' }
       });
+      this.audioChannel = (this.pythonProcess.stdio && this.pythonProcess.stdio[3]) || null;
+      this.stdoutBuffer = '';
+      this.stdoutDecoder = new StringDecoder('utf8');
 
       this.setupProcessHandlers();
       this.isReady = true;
@@ -55,11 +67,23 @@ class PythonSpeechService extends EventEmitter {
   }
 
   setupProcessHandlers() {
+    if (this.audioChannel) {
+      this.audioChannel.on('error', (error) => {
+        this.logs.errors.push(`Audio channel error: ${error.message}`);
+        this.audioChannel = null;
+      });
+    }
+
     // Handle stdout (responses from Python service)
     this.pythonProcess.stdout.on('data', (data) => {
-      const lines = data.toString().split('\n').filter(line => line.trim());
+      // Responses are newline-delimited; large ones (synthesized audio)
+      // can arrive split across several chunks, even inside a multi-byte
+      // UTF-8 character, so bytes are decoded across chunk boundaries
+      this.stdoutBuffer += this.stdoutDecoder.write(data);
+      const lines = this.stdoutBuffer.split('\n');
+      this.stdoutBuffer = lines.pop();
       
-      for (const line of lines) {
+      for (const line of lines.filter(line => line.trim())) {
         try {
           const response = JSON.parse(line);
           this.handlePythonResponse(response);
@@ -90,6 +114,7 @@ class PythonSpeechService extends EventEmitter {
     this.pythonProcess.on('exit', (code) => {
       this.isReady = false;
       this.pythonProcess = null;
+      this.audioChannel = null;
       
       if (code !== 0) {
         this.logs.errors.push(`Python service exited with code ${code}`);
@@ -136,6 +161,7 @@ class PythonSpeechService extends EventEmitter {
 
     this.pythonProcess.kill('SIGTERM');
     this.pythonProcess = null;
+    this.audioChannel = null;
     this.isReady = false;
     
     // Reject all pending requests
@@ -152,17 +178,64 @@ class PythonSpeechService extends EventEmitter {
   }
 
   async recognizeSpeech(audioBuffer, config = {}) {
-    const request = {
+    const recognizeConfig = {
+      language: 'en-US',
+      timeout: 5000,
+      ...config
+    };
+    const timeout = config.timeout || 5000;
+
+    if (this.audioChannel && this.isRunning()) {
+      let audioRef = null;
+      try {
+        ({ audioRef } = await this.prepareAudio(audioBuffer));
+      } catch (error) {
+        this.logs.errors.push(`Audio channel failed, sending base64 audio: ${error.message}`);
+        if (error.message !== 'Audio too large') {
+          this.audioChannel = null;
+        }
+      }
+
+      if (audioRef) {
+        try {
+          return await this.sendRequest(
+            { action: 'recognize', audioRef, config: recognizeConfig },
+            timeout
+          );
+        } catch (error) {
+          // The audio expired or was evicted before it was recognized
+          if (!error.message.startsWith('Unknown audio reference')) {
+            throw error;
+          }
+          this.logs.errors.push(`${error.message}, resending as base64 audio`);
+        }
+      }
+    }
+
+    return this.sendRequest({
       action: 'recognize',
       audioData: audioBuffer.toString('base64'),
-      config: {
-        language: 'en-US',
-        timeout: 5000,
-        ...config
-      }
-    };
+      config: recognizeConfig
+    }, timeout);
+  }
 
-    return this.sendRequest(request, config.timeout || 5000);
+  async prepareAudio(audioBuffer) {
+    // The frame must be written before the request that consumes it; the
+    // write only completes once Python reads it, so it is awaited alongside
+    // the request rather than before it
+    const header = Buffer.alloc(4);
+    header.writeUInt32BE(audioBuffer.length, 0);
+    const channel = this.audioChannel;
+    const written = new Promise((resolve, reject) => {
+      channel.write(header);
+      channel.write(audioBuffer, (error) => (error ? reject(error) : resolve()));
+    });
+
+    const [response] = await Promise.all([
+      this.sendRequest({ action: 'prepare_audio' }),
+      written
+    ]);
+    return response;
   }
 
   async synthesizeSpeech(text, config = {}) {
@@ -189,6 +262,45 @@ class PythonSpeechService extends EventEmitter {
     return Buffer.from(response.audioData, 'base64');
   }
 
+  async startRecognitionStream(config = {}) {
+    const request = {
+      action: 'stream_start',
+      config: {
+        language: 'en-US',
+        ...config
+      }
+    };
+
+    const response = await this.sendRequest(request);
+
+    if (response.error) {
+      throw new Error(response.error);
+    }
+
+    return response.streamId;
+  }
+
+  async sendRecognitionChunk(streamId, pcmBuffer, final = false) {
+    // Chunks are raw 16 kHz mono int16 PCM; await each before sending the next
+    const request = {
+      action: 'stream_chunk',
+      streamId,
+      audioData: pcmBuffer.toString('base64'),
+      final
+    };
+
+    return this.sendRequest(request);
+  }
+
+  async endRecognitionStream(streamId) {
+    const request = {
+      action: 'stream_end',
+      streamId
+    };
+
+    return this.sendRequest(request);
+  }
+
   async updateConfig(newConfig) {
     const request = {
       action: 'configure',
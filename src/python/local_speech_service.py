@@ -13,13 +13,38 @@ Protocol:
 """
 
 import sys
+import os
 import json
-import base64
+import binascii
+import ctypes
+import functools
+import hashlib
 import io
+import itertools
 import logging
-import threading
+import logging.handlers
+import math
 import queue
-from typing import Dict, Any, Optional
+import selectors
+import shutil
+import signal
+import tempfile
+import threading
+import time
+import uuid
+import wave
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Dict, Any, BinaryIO, List, Optional, Tuple
+
+# Non-blocking stdin needs fcntl; without it (Windows) a reader thread is used
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# Ask PortAudio for its lowest host latency; must be set before pyaudio loads
+os.environ.setdefault('PA_MIN_LATENCY_MSEC', '5')
 
 # Speech recognition and TTS imports
 SPEECH_LIBRARIES_AVAILABLE = False
@@ -36,9 +61,15 @@ except ImportError as e:
     class MockRecognizer:
         def adjust_for_ambient_noise(self, source, duration=1): pass
         def record(self, source): return None
-        def recognize_google(self, audio, language='en-US'): 
+        def recognize_google(self, audio, language='en-US', show_all=False): 
             raise Exception("Speech recognition libraries not installed")
     
+    class MockAudioData:
+        def __init__(self, frame_data, sample_rate, sample_width):
+            self.frame_data = frame_data
+            self.sample_rate = sample_rate
+            self.sample_width = sample_width
+    
     class MockMicrophone:
         def __enter__(self): return self
         def __exit__(self, *args): pass
@@ -53,6 +84,7 @@ except ImportError as e:
         'Recognizer': MockRecognizer,
         'Microphone': MockMicrophone,
         'AudioFile': MockMicrophone,
+        'AudioData': MockAudioData,
         'UnknownValueError': Exception,
         'RequestError': Exception
     })()
@@ -66,14 +98,198 @@ except ImportError as e:
     
     pyaudio = None
 
-# Configure logging to stderr
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[logging.StreamHandler(sys.stderr)]
-)
+# Fast JSON encoding (optional) - falls back to the standard library.
+# _dumps returns one newline-terminated response frame.
+try:
+    import orjson
+    
+    def _dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+    
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj: Any) -> bytes:
+        return (json.dumps(obj) + '\n').encode('utf-8')
+    
+    _loads = json.loads
+
+# Process memory reporting (optional) - /proc/self/statm is preferred on Linux
+PSUTIL_AVAILABLE = False
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    psutil = None
+
+try:
+    PAGE_SIZE = os.sysconf('SC_PAGE_SIZE')
+except (AttributeError, ValueError, OSError):
+    PAGE_SIZE = None
+
+# Vectorized audio normalization (optional) - falls back to the
+# speech_recognition AudioFile reader
+NUMPY_AVAILABLE = False
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+
+# Polyphase resampling (optional) - scipy.signal is imported on the first
+# resample rather than at startup because it is slow and memory-heavy
+@functools.lru_cache(maxsize=None)
+def _load_resample_poly():
+    """Return scipy's resample_poly, or None when scipy is not installed."""
+    try:
+        from scipy.signal import resample_poly
+    except ImportError:
+        return None
+    return resample_poly
+
+# Local Whisper recognition (optional) - falls back to Google Web Speech
+WHISPER_AVAILABLE = False
+try:
+    from faster_whisper import WhisperModel
+    WHISPER_AVAILABLE = True
+except ImportError:
+    WhisperModel = None
+
+# Configure logging to stderr. Records are only queued by the logging
+# thread; a background listener formats and writes them.
+_log_queue = queue.Queue(-1)
+_stderr_handler = logging.StreamHandler(sys.stderr)
+_stderr_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+log_listener = logging.handlers.QueueListener(_log_queue, _stderr_handler)
+
+_root_logger = logging.getLogger()
+_root_logger.setLevel(logging.INFO)
+_root_logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+log_listener.start()
+
 logger = logging.getLogger(__name__)
 
+# Synthesized audio is written to tmpfs when available so the WAV never
+# touches disk; pyttsx3 drivers only accept a filename as output target.
+TTS_OUTPUT_DIR = '/dev/shm' if os.access('/dev/shm', os.W_OK) else tempfile.gettempdir()
+
+# Whisper model used for local recognition
+WHISPER_MODEL = os.environ.get('WHISPER_MODEL', 'base.en')
+
+# Recognition input is normalized to mono int16 PCM at this rate
+RECOGNITION_SAMPLE_RATE = 16000
+
+# Largest decoded audio payload accepted: 30 s of 48 kHz stereo int16 WAV
+MAX_AUDIO_SECONDS = 30
+MAX_AUDIO_BYTES = MAX_AUDIO_SECONDS * 48000 * 2 * 2
+
+# Optional binary side channel for raw audio. When SPEECH_AUDIO_FD names an
+# inherited pipe, a reader thread takes frames (uint32 big-endian length
+# followed by the audio bytes) from it and answers 'prepare_audio' requests in
+# arrival order with an audioRef handle that 'recognize' accepts in place of
+# base64 audioData. A request whose frame does not arrive within
+# AUDIO_CHANNEL_TIMEOUT disables the channel, since frames and requests can no
+# longer be paired.
+AUDIO_CHANNEL_FD = os.environ.get('SPEECH_AUDIO_FD')
+MAX_AUDIO_REFS = 8
+AUDIO_REF_TTL = 30.0
+AUDIO_CHANNEL_READ_SIZE = 64 * 1024
+AUDIO_CHANNEL_TIMEOUT = 5.0
+
+# Request loop: stdin read size and how often idle state is expired
+STDIN_READ_SIZE = 64 * 1024
+HOUSEKEEPING_INTERVAL = 1.0
+
+# Worker threads for long-running requests; other actions are answered inline
+REQUEST_WORKERS = 4
+POOLED_ACTIONS = frozenset({'recognize', 'stream_chunk', 'stream_end'})
+
+# Streaming recognition: chunks are raw 16 kHz mono int16 PCM. A partial
+# transcript is decoded every STREAM_DECODE_INTERVAL seconds of new audio and
+# the active window is capped at STREAM_WINDOW_SECONDS. Without a local model
+# for the stream's language interim decodes are skipped, since each one
+# re-uploads the whole window to Google; the window is then only decoded when
+# it fills or the stream ends.
+STREAM_SAMPLE_RATE = 16000
+STREAM_SAMPLE_WIDTH = 2
+STREAM_WINDOW_SECONDS = 30
+STREAM_DECODE_INTERVAL = 1.0
+STREAM_MAX_BYTES = STREAM_WINDOW_SECONDS * STREAM_SAMPLE_RATE * STREAM_SAMPLE_WIDTH
+STREAM_DECODE_BYTES = int(STREAM_DECODE_INTERVAL * STREAM_SAMPLE_RATE) * STREAM_SAMPLE_WIDTH
+# Streams without a chunk for this many seconds are discarded
+STREAM_IDLE_TIMEOUT = 60.0
+
+# Maximum number of queued utterances rendered per runAndWait() cycle
+TTS_BATCH_SIZE = 8
+# Seconds a caller waits for its utterance before giving up
+TTS_RESULT_TIMEOUT = 30.0
+
+# Bounds of the LRU cache of synthesized utterances (base64 audio)
+TTS_CACHE_MAX_ENTRIES = 128
+TTS_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# Optional CPU to pin the audio worker threads to, e.g. SPEECH_SERVICE_CPU=3
+AUDIO_THREAD_CPU = os.environ.get('SPEECH_SERVICE_CPU')
+
+# Windows SetThreadPriority level
+THREAD_PRIORITY_ABOVE_NORMAL = 1
+
+def _elevate_thread_priority(realtime: bool = False):
+    """
+    Best-effort raise of the calling thread's scheduling priority.
+    
+    Realtime (SCHED_RR) scheduling is only requested for the TTS worker,
+    which drives audio output; CPU-bound recognition threads only get a
+    lower nice value so they cannot starve the rest of the desktop. Missing
+    privileges are not an error - the thread keeps its default priority.
+    """
+    try:
+        if sys.platform == 'win32':
+            kernel32 = ctypes.windll.kernel32
+            kernel32.SetThreadPriority(kernel32.GetCurrentThread(), THREAD_PRIORITY_ABOVE_NORMAL)
+        else:
+            elevated = False
+            if realtime and hasattr(os, 'sched_setscheduler'):
+                try:
+                    # pid 0 targets the calling thread on Linux
+                    os.sched_setscheduler(0, os.SCHED_RR, os.sched_param(10))
+                    elevated = True
+                except OSError:
+                    pass
+            
+            if not elevated:
+                os.nice(-5)
+    except (OSError, AttributeError) as e:
+        logger.debug(f"Could not raise thread priority: {e}")
+    
+    if AUDIO_THREAD_CPU is not None and hasattr(os, 'sched_setaffinity'):
+        try:
+            os.sched_setaffinity(0, {int(AUDIO_THREAD_CPU)})
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not pin thread to CPU {AUDIO_THREAD_CPU}: {e}")
+
+
+def _exit_on_sigterm(signum, frame):
+    """Turn SIGTERM into a clean exit so run() unwinds through its cleanup."""
+    raise SystemExit(0)
+
+
+class RecognitionStream:
+    """Audio window and transcript state of one streaming recognition session."""
+    
+    def __init__(self, language: str):
+        self.language = language
+        self.buffer = bytearray()
+        self.pending_bytes = 0
+        self.committed = []
+        self.partial = ''
+        self.lock = threading.Lock()
+        self.last_activity = time.monotonic()
+    
+    @property
+    def transcript(self) -> str:
+        return ' '.join(self.committed + [self.partial]).strip()
+
+
 class LocalSpeechService:
     def __init__(self):
         self.config = {
@@ -87,15 +303,54 @@ class LocalSpeechService:
         # Initialize speech recognition
         self.recognizer = sr.Recognizer()
         self.microphone = None
+        self.asr_model = None
+        self._asr_multilingual = False
         
         # Initialize TTS engine
         self.tts_engine = None
-        self.tts_lock = threading.Lock()
+        self._tts_queue = queue.Queue()
+        self._tts_worker = None
+        self._tts_output_dir = None
+        self._tts_output_counter = itertools.count()
+        self._tts_cache = OrderedDict()
+        self._tts_cache_bytes = 0
+        self._tts_cache_lock = threading.Lock()
+        
+        # Synthesis requests awaiting the TTS worker: future -> (deadline,
+        # requestId). Whoever removes an entry sends its response.
+        self._pending_synthesis: Dict[Future, Tuple[float, Any]] = {}
+        self._synthesis_lock = threading.Condition()
         
         # Service state
         self.is_ready = False
-        self.is_listening = False
+        self.is_calibrating = False
         self.last_error = None
+        self._log_listener = log_listener
+        self._active_recognitions = 0
+        self._listening_lock = threading.Lock()
+        self._process = psutil.Process() if PSUTIL_AVAILABLE else None
+        
+        # Audio frames received over the side channel, by audioRef
+        self._audio_channel = self._open_audio_channel()
+        self._audio_channel_failed = False
+        self._prepare_waiters = deque()
+        self._prepare_lock = threading.Condition()
+        self._audio_refs = OrderedDict()
+        self._audio_refs_lock = threading.Lock()
+        
+        # Active streaming recognition sessions by streamId
+        self._streams: Dict[str, RecognitionStream] = {}
+        self._streams_lock = threading.Lock()
+        
+        # Raw request lines from the stdin reader and encoded responses
+        # for the stdout writer, so parsing and I/O overlap with processing
+        self._request_queue = queue.Queue()
+        self._response_queue = queue.Queue()
+        self._executor = ThreadPoolExecutor(
+            max_workers=REQUEST_WORKERS,
+            thread_name_prefix='request-worker',
+            initializer=_elevate_thread_priority
+        )
         
         # Initialize components
         self._initialize_components()
@@ -103,18 +358,34 @@ class LocalSpeechService:
     def _initialize_components(self):
         """Initialize speech recognition and TTS components."""
         try:
+            if WHISPER_AVAILABLE:
+                # Loading (and possibly downloading) the model runs in the
+                # background; Google recognition is used until it is ready
+                threading.Thread(
+                    target=self._initialize_asr_model,
+                    name='asr-model-loader',
+                    daemon=True
+                ).start()
+            
             if SPEECH_LIBRARIES_AVAILABLE:
                 # Initialize microphone
                 self.microphone = sr.Microphone()
-                with self.microphone as source:
-                    logger.info("Adjusting for ambient noise...")
-                    self.recognizer.adjust_for_ambient_noise(source, duration=1)
-                    logger.info("Ambient noise adjustment complete")
                 
-                # Initialize TTS engine
-                self.tts_engine = pyttsx3.init()
-                self.tts_engine.setProperty('rate', self.config['voice_rate'])
-                self.tts_engine.setProperty('volume', self.config['voice_volume'])
+                # Rendered utterances go in a private (0700) directory so
+                # their predictable names cannot be pre-created by others
+                self._tts_output_dir = tempfile.mkdtemp(prefix='tts-', dir=TTS_OUTPUT_DIR)
+                
+                # Initialize TTS engine on the worker thread, its only user;
+                # the sapi5 and nsss drivers are bound to their creating thread
+                engine_ready = Future()
+                self._tts_worker = threading.Thread(
+                    target=self._tts_worker_loop,
+                    args=(engine_ready,),
+                    name='tts-worker',
+                    daemon=True
+                )
+                self._tts_worker.start()
+                self.tts_engine = engine_ready.result()
                 
                 logger.info("Speech service initialized successfully")
             else:
@@ -126,43 +397,113 @@ class LocalSpeechService:
             self.is_ready = True
             self.last_error = None
             
+            if SPEECH_LIBRARIES_AVAILABLE:
+                # Ambient noise calibration runs in the background so requests
+                # are served immediately. It starts only after the ready state
+                # is set so that a quick calibration failure is not overwritten.
+                self.is_calibrating = True
+                threading.Thread(
+                    target=self._calibrate_microphone,
+                    name='mic-calibration',
+                    daemon=True
+                ).start()
+            
         except Exception as e:
             self.last_error = str(e)
             self.is_ready = False
             logger.error(f"Failed to initialize speech service: {e}")
     
+    def _calibrate_microphone(self):
+        """Adjust the recognizer's energy threshold to the ambient noise level."""
+        try:
+            with self.microphone as source:
+                logger.info("Adjusting for ambient noise...")
+                self.recognizer.adjust_for_ambient_noise(source, duration=1)
+                logger.info("Ambient noise adjustment complete")
+        
+        except Exception as e:
+            self.last_error = str(e)
+            self.is_ready = False
+            logger.error(f"Failed to calibrate microphone: {e}")
+        
+        finally:
+            self.is_calibrating = False
+    
+    def _initialize_asr_model(self):
+        """Load the local Whisper model, leaving Google recognition as fallback."""
+        try:
+            model = WhisperModel(
+                WHISPER_MODEL,
+                device='auto',
+                compute_type='int8',
+                num_workers=REQUEST_WORKERS
+            )
+            self._asr_multilingual = model.model.is_multilingual
+            self.asr_model = model
+            logger.info(f"Local Whisper model '{WHISPER_MODEL}' loaded")
+        except Exception as e:
+            self.asr_model = None
+            logger.warning(f"Failed to load Whisper model, using Google recognition: {e}")
+    
+    def _local_asr_model(self, language: str) -> Optional[Any]:
+        """
+        Return the Whisper model if it can transcribe language, else None.
+        
+        English-only models (such as the default base.en) ignore the
+        language hint, so other languages stay on Google recognition.
+        """
+        model = self.asr_model
+        if model is None:
+            return None
+        if self._asr_multilingual or language.lower().startswith('en'):
+            return model
+        return None
+    
+    @property
+    def is_listening(self) -> bool:
+        """Whether any recognition request is currently in progress."""
+        return self._active_recognitions > 0
+    
     def get_status(self) -> Dict[str, Any]:
         """Get current service status."""
-        return {
-            'isReady': self.is_ready,
+        status = {
+            'isReady': self.is_ready and not self.is_calibrating,
             'isListening': self.is_listening,
             'currentLanguage': self.config['language'],
             'lastError': self.last_error,
             'memoryUsage': self._get_memory_usage()
         }
+        
+        if self.is_calibrating:
+            status['reason'] = 'calibrating'
+        
+        return status
     
     def _get_memory_usage(self) -> float:
         """Get approximate memory usage in MB."""
-        try:
-            import psutil
-            process = psutil.Process()
-            return round(process.memory_info().rss / 1024 / 1024, 1)
-        except:
-            return 0.0
+        if PAGE_SIZE:
+            try:
+                with open('/proc/self/statm', 'rb') as statm:
+                    rss_pages = int(statm.read().split()[1])
+                return round(rss_pages * PAGE_SIZE / 1024 / 1024, 1)
+            except (OSError, ValueError, IndexError):
+                pass
+        
+        if self._process:
+            try:
+                return round(self._process.memory_info().rss / 1024 / 1024, 1)
+            except Exception:
+                pass
+        
+        return 0.0
     
     def update_config(self, new_config: Dict[str, Any]) -> Dict[str, Any]:
         """Update service configuration."""
         try:
-            # Update configuration
+            # Update configuration; TTS settings are applied by the
+            # worker thread on each queued utterance
             self.config.update(new_config)
             
-            # Apply TTS settings if changed
-            if self.tts_engine:
-                if 'voice_rate' in new_config:
-                    self.tts_engine.setProperty('rate', self.config['voice_rate'])
-                if 'voice_volume' in new_config:
-                    self.tts_engine.setProperty('volume', self.config['voice_volume'])
-            
             logger.info(f"Configuration updated: {new_config}")
             return {'success': True}
             
@@ -171,13 +512,15 @@ class LocalSpeechService:
             logger.error(error_msg)
             return {'error': error_msg}
     
-    def recognize_speech(self, audio_data: str, config: Dict[str, Any]) -> Dict[str, Any]:
+    def recognize_speech(self, audio_data: str, config: Dict[str, Any],
+                         audio_ref: Optional[str] = None) -> Dict[str, Any]:
         """
         Recognize speech from base64-encoded audio data.
         
         Args:
             audio_data: Base64-encoded audio data
             config: Recognition configuration (language, timeout, etc.)
+            audio_ref: Handle from prepare_audio, used instead of audio_data
             
         Returns:
             Dictionary with transcript, confidence, and optional error
@@ -189,19 +532,59 @@ class LocalSpeechService:
                 'error': 'Service not ready'
             }
         
+        if audio_ref is not None:
+            audio_bytes = self._take_audio_ref(audio_ref)
+            if audio_bytes is None:
+                return {
+                    'transcript': '',
+                    'confidence': 0.0,
+                    'error': f'Unknown audio reference: {audio_ref}'
+                }
+        
+        elif self._estimate_decoded_size(audio_data) > MAX_AUDIO_BYTES:
+            logger.warning(f"Rejected recognition request with {len(audio_data)} bytes of base64 audio")
+            return {
+                'transcript': '',
+                'confidence': 0.0,
+                'error': 'Audio too large'
+            }
+        
+        language = config.get('language', self.config['language'])
+        # Chosen once, since the model can finish loading mid-request
+        asr_model = self._local_asr_model(language)
+        
+        with self._listening_lock:
+            self._active_recognitions += 1
+        
         try:
-            self.is_listening = True
-            
             # Decode audio data
             try:
-                audio_bytes = base64.b64decode(audio_data)
-                audio_io = io.BytesIO(audio_bytes)
+                if audio_ref is None:
+                    audio_bytes = binascii.a2b_base64(audio_data)
                 
-                # Create AudioData object from bytes
                 # Note: This assumes WAV format - in real implementation,
-                # you'd need proper audio format detection
-                with sr.AudioFile(audio_io) as source:
-                    audio = self.recognizer.record(source)
+                # you'd need proper audio format detection. BytesIO shares the
+                # decoded bytes without copying them, and a reader per call lets
+                # pool workers decode clips in parallel.
+                audio_io = io.BytesIO(audio_bytes)
+                if NUMPY_AVAILABLE:
+                    try:
+                        pcm = self._decode_wav_pcm(audio_io)
+                    except wave.Error:
+                        # AIFF, AIFF-C and FLAC go through speech_recognition
+                        audio_io.seek(0)
+                        with sr.AudioFile(audio_io) as source:
+                            audio = self.recognizer.record(source)
+                        pcm = np.frombuffer(
+                            audio.get_raw_data(convert_rate=RECOGNITION_SAMPLE_RATE, convert_width=2),
+                            dtype='<i2'
+                        )
+                else:
+                    with sr.AudioFile(audio_io) as source:
+                        audio = self.recognizer.record(source)
+                
+                if NUMPY_AVAILABLE and asr_model is None:
+                    audio = sr.AudioData(pcm.tobytes(), RECOGNITION_SAMPLE_RATE, 2)
                     
             except Exception as e:
                 return {
@@ -211,18 +594,15 @@ class LocalSpeechService:
                 }
             
             # Perform recognition
-            language = config.get('language', self.config['language'])
             timeout = config.get('timeout', self.config['timeout'])
             
+            if asr_model is not None:
+                samples = pcm.astype(np.float32) / 32768.0
+                return self._transcribe_local(samples, language)
+            
             try:
                 # Use Google Speech Recognition (free tier)
-                transcript = self.recognizer.recognize_google(
-                    audio, 
-                    language=language
-                )
-                
-                # Calculate confidence (Google API doesn't provide this directly)
-                confidence = min(0.9, max(0.1, len(transcript) / 100.0))
+                transcript, confidence = self._recognize_google(audio, language)
                 
                 logger.info(f"Recognition successful: '{transcript}' (confidence: {confidence})")
                 
@@ -257,7 +637,373 @@ class LocalSpeechService:
             }
         
         finally:
-            self.is_listening = False
+            with self._listening_lock:
+                self._active_recognitions -= 1
+    
+    def prepare_audio(self) -> Dict[str, Any]:
+        """Wait for the next side-channel frame and return its audioRef handle."""
+        try:
+            return self.prepare_audio_async().result(timeout=AUDIO_CHANNEL_TIMEOUT)
+        except FutureTimeoutError:
+            return {'error': 'Timed out waiting for audio frame'}
+    
+    def prepare_audio_async(self) -> Future:
+        """
+        Queue a prepare_audio request without waiting for its frame.
+        
+        Must be called in the order prepare_audio requests arrive, since
+        the reader thread matches frames to waiters by position.
+        """
+        with self._prepare_lock:
+            if self._audio_channel is None or self._audio_channel_failed:
+                return self._resolved_future({'error': 'Audio channel not available'})
+            
+            future = Future()
+            self._prepare_waiters.append((time.monotonic() + AUDIO_CHANNEL_TIMEOUT, future))
+            self._prepare_lock.notify_all()
+            return future
+    
+    def _read_audio_frames(self):
+        """Read side-channel frames and hand each to the oldest waiting request."""
+        try:
+            while True:
+                length = int.from_bytes(self._read_audio_channel(4), 'big')
+                
+                if length > MAX_AUDIO_BYTES:
+                    self._skip_audio_channel(length)
+                    logger.warning(f"Rejected {length} byte audio frame")
+                    response = {'error': 'Audio too large'}
+                else:
+                    audio_bytes = self._read_audio_channel(length)
+                    response = None
+                
+                with self._prepare_lock:
+                    self._prepare_lock.wait_for(
+                        lambda: self._prepare_waiters or self._audio_channel_failed
+                    )
+                    if self._audio_channel_failed:
+                        # Keep draining so the client's writes never block
+                        continue
+                    _, future = self._prepare_waiters.popleft()
+                
+                if response is None:
+                    response = {'audioRef': self._store_audio_ref(audio_bytes)}
+                future.set_result(response)
+        
+        except (OSError, EOFError) as e:
+            # Frame boundaries are lost after a short or failed read
+            logger.error(f"Failed to read audio channel, disabling it: {e}")
+            self._fail_audio_channel(f'Failed to read audio channel: {e}')
+    
+    def _expire_prepare_waiters(self, now: float):
+        """Disable the side channel if a prepare_audio request missed its frame."""
+        with self._prepare_lock:
+            overdue = bool(self._prepare_waiters) and self._prepare_waiters[0][0] <= now
+        
+        if overdue:
+            logger.error("Timed out waiting for audio frame, disabling audio channel")
+            self._fail_audio_channel('Timed out waiting for audio frame')
+    
+    def _fail_audio_channel(self, error: str):
+        """Stop pairing frames with requests and answer every waiting request."""
+        with self._prepare_lock:
+            self._audio_channel_failed = True
+            waiters = list(self._prepare_waiters)
+            self._prepare_waiters.clear()
+            self._prepare_lock.notify_all()
+        
+        for _, future in waiters:
+            future.set_result({'error': error})
+    
+    def _store_audio_ref(self, audio_bytes: bytearray) -> str:
+        """Keep received audio under a new handle, evicting the oldest entries."""
+        audio_ref = uuid.uuid4().hex
+        with self._audio_refs_lock:
+            self._audio_refs[audio_ref] = (time.monotonic(), audio_bytes)
+            while len(self._audio_refs) > MAX_AUDIO_REFS:
+                self._audio_refs.popitem(last=False)
+        
+        return audio_ref
+    
+    def _take_audio_ref(self, audio_ref: str) -> Optional[bytearray]:
+        """Remove and return the audio stored under a prepare_audio handle."""
+        with self._audio_refs_lock:
+            entry = self._audio_refs.pop(audio_ref, None)
+        
+        return entry[1] if entry else None
+    
+    @staticmethod
+    def _open_audio_channel() -> Optional[BinaryIO]:
+        """Open the inherited audio side channel, if the parent provided one."""
+        if AUDIO_CHANNEL_FD is None:
+            return None
+        
+        try:
+            return os.fdopen(int(AUDIO_CHANNEL_FD), 'rb', buffering=0)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Audio channel unavailable, using base64 audio only: {e}")
+            return None
+    
+    def _read_audio_channel(self, length: int) -> bytearray:
+        """Read exactly length bytes from the side channel into a new buffer."""
+        buffer = bytearray(length)
+        view = memoryview(buffer)
+        position = 0
+        
+        while position < length:
+            count = self._audio_channel.readinto(view[position:])
+            if not count:
+                raise EOFError('Audio channel closed')
+            position += count
+        
+        return buffer
+    
+    def _skip_audio_channel(self, length: int):
+        """Discard length bytes from the side channel."""
+        while length > 0:
+            chunk = self._audio_channel.read(min(length, AUDIO_CHANNEL_READ_SIZE))
+            if not chunk:
+                raise EOFError('Audio channel closed')
+            length -= len(chunk)
+    
+    def start_stream(self, config: Dict[str, Any]) -> Dict[str, Any]:
+        """Open a streaming recognition session and return its streamId."""
+        if not self.is_ready:
+            return {'error': 'Service not ready'}
+        
+        stream_id = uuid.uuid4().hex
+        language = config.get('language', self.config['language'])
+        
+        with self._streams_lock:
+            self._streams[stream_id] = RecognitionStream(language)
+        
+        logger.info(f"Recognition stream {stream_id} started")
+        return {'streamId': stream_id}
+    
+    def recognize_stream_chunk(self, stream_id: str, audio_data: str, final: bool = False) -> Dict[str, Any]:
+        """
+        Append a chunk of audio to a stream and return its running transcript.
+        
+        Chunks of one stream must be sent sequentially, waiting for each
+        response before sending the next one.
+        
+        Args:
+            stream_id: Stream returned by start_stream
+            audio_data: Base64-encoded 16 kHz mono int16 PCM
+            final: Whether to commit all buffered audio now
+            
+        Returns:
+            Dictionary with streamId, transcript, final and optional error
+        """
+        with self._streams_lock:
+            stream = self._streams.get(stream_id)
+        
+        if stream is None:
+            return {'error': f'Unknown stream: {stream_id}'}
+        
+        if self._estimate_decoded_size(audio_data) > STREAM_MAX_BYTES:
+            return {'streamId': stream_id, 'error': 'Audio too large'}
+        
+        try:
+            pcm = binascii.a2b_base64(audio_data) if audio_data else b''
+        except binascii.Error:
+            return {'streamId': stream_id, 'error': 'Audio format not supported'}
+        
+        try:
+            with stream.lock:
+                stream.last_activity = time.monotonic()
+                stream.buffer += pcm
+                stream.pending_bytes += len(pcm)
+                
+                interim_due = (self._local_asr_model(stream.language) is not None
+                               and stream.pending_bytes >= STREAM_DECODE_BYTES)
+                if final or interim_due or len(stream.buffer) > STREAM_MAX_BYTES:
+                    self._decode_stream(stream, final)
+                
+                return {
+                    'streamId': stream_id,
+                    'transcript': stream.transcript,
+                    'final': final
+                }
+        
+        except Exception as e:
+            logger.error(f"Stream recognition failed: {e}")
+            return {'streamId': stream_id, 'error': str(e)}
+    
+    def end_stream(self, stream_id: str) -> Dict[str, Any]:
+        """Flush and close a stream, returning its final transcript."""
+        response = self.recognize_stream_chunk(stream_id, '', final=True)
+        
+        with self._streams_lock:
+            self._streams.pop(stream_id, None)
+        
+        logger.info(f"Recognition stream {stream_id} ended")
+        return response
+    
+    def _decode_stream(self, stream: RecognitionStream, final: bool):
+        """
+        Decode a stream's audio window, committing text that is complete.
+        
+        When the window overflows, every segment but the trailing (possibly
+        unfinished) one is committed and its audio sliced off the front of
+        the buffer. Caller must hold stream.lock.
+        """
+        segments = self._transcribe_pcm(bytes(stream.buffer), stream.language) if stream.buffer else []
+        stream.pending_bytes = 0
+        
+        if final:
+            stream.committed.extend(text for text, _ in segments)
+            stream.buffer.clear()
+            stream.partial = ''
+            return
+        
+        if len(stream.buffer) <= STREAM_MAX_BYTES:
+            stream.partial = ' '.join(text for text, _ in segments)
+            return
+        
+        if not segments:
+            # Nothing recognized in a full window - drop the oldest audio
+            del stream.buffer[:len(stream.buffer) - STREAM_MAX_BYTES]
+            stream.partial = ''
+            return
+        
+        completed = segments[:-1] if len(segments) > 1 else segments
+        stream.committed.extend(text for text, _ in completed)
+        
+        cut = int(completed[-1][1] * STREAM_SAMPLE_RATE) * STREAM_SAMPLE_WIDTH
+        del stream.buffer[:cut]
+        stream.partial = segments[-1][0] if len(segments) > 1 else ''
+    
+    def _transcribe_pcm(self, pcm: bytes, language: str) -> List[Tuple[str, float]]:
+        """Transcribe 16 kHz mono int16 PCM into (text, end time) segments."""
+        if self._local_asr_model(language) is not None:
+            samples = np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768.0
+            segments, _ = self.asr_model.transcribe(
+                samples,
+                language=language.split('-')[0],
+                beam_size=1,
+                vad_filter=True
+            )
+            return [
+                (segment.text.strip(), segment.end)
+                for segment in segments
+                if segment.text.strip()
+            ]
+        
+        audio = sr.AudioData(pcm, STREAM_SAMPLE_RATE, STREAM_SAMPLE_WIDTH)
+        try:
+            transcript, _ = self._recognize_google(audio, language)
+        except sr.UnknownValueError:
+            return []
+        
+        # Google returns one result for the whole window
+        return [(transcript, len(pcm) / (STREAM_SAMPLE_RATE * STREAM_SAMPLE_WIDTH))]
+    
+    def _recognize_google(self, audio: Any, language: str) -> Tuple[str, float]:
+        """
+        Recognize audio with Google and return the best transcript and its confidence.
+        
+        Google only scores some alternatives; when none carries a
+        confidence, a length-based estimate is used instead.
+        """
+        result = self.recognizer.recognize_google(audio, language=language, show_all=True)
+        alternatives = result.get('alternative') if isinstance(result, dict) else None
+        if not alternatives:
+            raise sr.UnknownValueError()
+        
+        best = max(alternatives, key=lambda alternative: alternative.get('confidence', 0.0))
+        transcript = best['transcript']
+        
+        if 'confidence' in best:
+            confidence = best['confidence']
+        else:
+            confidence = min(0.9, max(0.1, len(transcript) / 100.0))
+        
+        return transcript, confidence
+    
+    @staticmethod
+    def _estimate_decoded_size(audio_data: str) -> int:
+        """Upper bound of the decoded size of a base64 payload, without decoding it."""
+        return (len(audio_data) * 3) // 4
+    
+    def _decode_wav_pcm(self, audio_io: BinaryIO) -> 'np.ndarray':
+        """
+        Decode a WAV stream into mono int16 PCM at the recognition sample rate.
+        
+        Sample width conversion, channel downmix and resampling are done
+        with NumPy array operations (scipy's polyphase resampler when
+        available) instead of speech_recognition's per-frame Python code.
+        """
+        with wave.open(audio_io, 'rb') as wav_file:
+            channels = wav_file.getnchannels()
+            sample_width = wav_file.getsampwidth()
+            sample_rate = wav_file.getframerate()
+            frames = wav_file.readframes(wav_file.getnframes())
+        
+        if sample_width == 1:
+            pcm = (np.frombuffer(frames, dtype=np.uint8).astype(np.int16) - 128) << 8
+        elif sample_width == 2:
+            pcm = np.frombuffer(frames, dtype='<i2')
+        elif sample_width == 3:
+            # Keep the two most significant bytes of each 24-bit sample
+            pcm = np.frombuffer(frames, dtype=np.uint8).reshape(-1, 3)[:, 1:].copy().view('<i2').ravel()
+        elif sample_width == 4:
+            pcm = (np.frombuffer(frames, dtype='<i4') >> 16).astype(np.int16)
+        else:
+            raise ValueError(f"Unsupported sample width: {sample_width}")
+        
+        if channels > 1:
+            pcm = pcm.reshape(-1, channels).mean(axis=1)
+        
+        if sample_rate != RECOGNITION_SAMPLE_RATE and len(pcm):
+            resample_poly = _load_resample_poly()
+            if resample_poly is not None:
+                divisor = math.gcd(RECOGNITION_SAMPLE_RATE, sample_rate)
+                pcm = resample_poly(
+                    pcm.astype(np.float32),
+                    RECOGNITION_SAMPLE_RATE // divisor,
+                    sample_rate // divisor
+                )
+            else:
+                target_length = int(round(len(pcm) * RECOGNITION_SAMPLE_RATE / sample_rate))
+                positions = np.linspace(0, len(pcm) - 1, num=target_length)
+                pcm = np.interp(positions, np.arange(len(pcm)), pcm)
+        
+        if pcm.dtype != np.int16:
+            pcm = np.clip(np.rint(pcm), -32768, 32767).astype(np.int16)
+        
+        return pcm
+    
+    def _transcribe_local(self, samples: 'np.ndarray', language: str) -> Dict[str, Any]:
+        """Transcribe decoded samples with the local Whisper model."""
+        segments, _ = self.asr_model.transcribe(
+            samples,
+            language=language.split('-')[0],
+            beam_size=1,
+            vad_filter=True
+        )
+        segments = list(segments)
+        transcript = ''.join(segment.text for segment in segments).strip()
+        
+        if not transcript:
+            logger.warning("Speech recognition could not understand audio")
+            return {
+                'transcript': '',
+                'confidence': 0.0,
+                'error': 'Could not understand audio'
+            }
+        
+        # avg_logprob is a mean token log-probability; exp() maps it to (0, 1]
+        avg_logprob = sum(segment.avg_logprob for segment in segments) / len(segments)
+        confidence = round(math.exp(avg_logprob), 3)
+        
+        logger.info(f"Recognition successful: '{transcript}' (confidence: {confidence})")
+        
+        return {
+            'transcript': transcript,
+            'confidence': confidence,
+            'language': language
+        }
     
     def synthesize_speech(self, text: str, config: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -270,59 +1016,201 @@ class LocalSpeechService:
         Returns:
             Dictionary with audioData (base64) or error
         """
+        future = self.synthesize_speech_async(text, config)
+        
+        try:
+            return future.result(timeout=TTS_RESULT_TIMEOUT)
+        except FutureTimeoutError:
+            future.cancel()
+            logger.error(f"Speech synthesis timed out for text: '{text[:50]}...'")
+            return {'error': 'Speech synthesis timed out'}
+    
+    def synthesize_speech_async(self, text: str, config: Dict[str, Any]) -> Future:
+        """
+        Queue speech synthesis without waiting for it.
+        
+        The TTS worker thread resolves the returned Future, so callers can
+        use add_done_callback instead of blocking a thread on the result.
+        
+        Args:
+            text: Text to synthesize
+            config: Synthesis configuration (voice, rate, etc.)
+            
+        Returns:
+            Future resolving to the synthesize_speech response dictionary
+        """
         if not text or not text.strip():
-            return {'error': 'Text cannot be empty'}
+            return self._resolved_future({'error': 'Text cannot be empty'})
         
         if not self.is_ready or not self.tts_engine:
-            return {'error': 'TTS engine not ready'}
+            return self._resolved_future({'error': 'TTS engine not ready'})
         
         try:
+            # Configure TTS settings from config
+            rate = config.get('voice_rate', self.config['voice_rate'])
+            volume = config.get('voice_volume', self.config['voice_volume'])
+            voice = config.get('voice', 'default')
+            
+            cache_key = self._tts_cache_key(text, voice, rate, volume)
+            cached_audio = self._get_cached_tts(cache_key)
+            if cached_audio is not None:
+                logger.info(f"Speech synthesis cache hit for text: '{text[:50]}...'")
+                return self._resolved_future({'audioData': cached_audio, 'cached': True})
+            
             if not SPEECH_LIBRARIES_AVAILABLE:
                 # Mock mode - return fake audio data
                 fake_audio_data = f"Mock audio data for: {text}"
-                audio_base64 = base64.b64encode(fake_audio_data.encode()).decode('utf-8')
+                audio_base64 = binascii.b2a_base64(fake_audio_data.encode(), newline=False).decode('ascii')
                 logger.info(f"Mock speech synthesis for text: '{text[:50]}...'")
-                return {'audioData': audio_base64}
+                self._put_cached_tts(cache_key, audio_base64)
+                return self._resolved_future({'audioData': audio_base64})
             
-            with self.tts_lock:
-                # Create temporary file for audio output
-                import tempfile
-                import wave
-                
-                with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_file:
-                    temp_filename = temp_file.name
-                
-                # Configure TTS settings from config
-                rate = config.get('voice_rate', self.config['voice_rate'])
-                volume = config.get('voice_volume', self.config['voice_volume'])
-                
-                self.tts_engine.setProperty('rate', rate)
-                self.tts_engine.setProperty('volume', volume)
-                
-                # Save speech to file
-                self.tts_engine.save_to_file(text, temp_filename)
-                self.tts_engine.runAndWait()
-                
-                # Read the audio file and encode as base64
+            future = Future()
+            future.add_done_callback(functools.partial(self._cache_tts_result, cache_key))
+            self._tts_queue.put((text, rate, volume, future))
+            return future
+        
+        except Exception as e:
+            logger.error(f"Speech synthesis failed: {e}")
+            return self._resolved_future({'error': str(e)})
+    
+    @staticmethod
+    def _resolved_future(response: Dict[str, Any]) -> Future:
+        """Wrap an immediately available response in a completed Future."""
+        future = Future()
+        future.set_result(response)
+        return future
+    
+    @staticmethod
+    def _tts_cache_key(text: str, voice: str, rate: Any, volume: Any) -> bytes:
+        """Build the cache key for an utterance and its synthesis settings."""
+        return hashlib.blake2b(
+            f"{rate}|{volume}|{voice}|{text}".encode('utf-8'),
+            digest_size=16
+        ).digest()
+    
+    def _get_cached_tts(self, key: bytes) -> Optional[str]:
+        """Return cached base64 audio for key, marking it most recently used."""
+        with self._tts_cache_lock:
+            audio_base64 = self._tts_cache.get(key)
+            if audio_base64 is not None:
+                self._tts_cache.move_to_end(key)
+            return audio_base64
+    
+    def _put_cached_tts(self, key: bytes, audio_base64: str):
+        """Cache base64 audio, evicting least recently used entries over the limits."""
+        size = len(audio_base64)
+        if size > TTS_CACHE_MAX_BYTES:
+            return
+        
+        with self._tts_cache_lock:
+            previous = self._tts_cache.pop(key, None)
+            if previous is not None:
+                self._tts_cache_bytes -= len(previous)
+            
+            self._tts_cache[key] = audio_base64
+            self._tts_cache_bytes += size
+            
+            while (len(self._tts_cache) > TTS_CACHE_MAX_ENTRIES
+                   or self._tts_cache_bytes > TTS_CACHE_MAX_BYTES):
+                _, evicted = self._tts_cache.popitem(last=False)
+                self._tts_cache_bytes -= len(evicted)
+    
+    def _cache_tts_result(self, key: bytes, future: Future):
+        """Cache the audio of a completed synthesis."""
+        if future.cancelled():
+            return
+        
+        response = future.result()
+        if 'audioData' in response:
+            self._put_cached_tts(key, response['audioData'])
+    
+    def _tts_worker_loop(self, engine_ready: Future):
+        """Create and own the TTS engine, then render queued utterances in batches."""
+        _elevate_thread_priority(realtime=True)
+        
+        try:
+            engine = pyttsx3.init()
+            engine.setProperty('rate', self.config['voice_rate'])
+            engine.setProperty('volume', self.config['voice_volume'])
+        except Exception as e:
+            engine_ready.set_exception(e)
+            return
+        
+        engine_ready.set_result(engine)
+        
+        while True:
+            batch = [self._tts_queue.get()]
+            while len(batch) < TTS_BATCH_SIZE:
                 try:
-                    with open(temp_filename, 'rb') as audio_file:
-                        audio_data = audio_file.read()
-                        audio_base64 = base64.b64encode(audio_data).decode('utf-8')
-                    
-                    # Clean up temporary file
-                    import os
-                    os.unlink(temp_filename)
-                    
-                    logger.info(f"Speech synthesis successful for text: '{text[:50]}...'")
-                    return {'audioData': audio_base64}
-                    
-                except Exception as e:
-                    logger.error(f"Failed to read synthesized audio: {e}")
-                    return {'error': f'Failed to read audio file: {e}'}
+                    batch.append(self._tts_queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            try:
+                self._synthesize_batch(batch)
+            finally:
+                for _ in batch:
+                    self._tts_queue.task_done()
+    
+    def _synthesize_batch(self, batch):
+        """Render a batch of utterances with a single runAndWait() cycle."""
+        jobs = [
+            (item, self._next_tts_output_path())
+            for item in batch
+            if item[3].set_running_or_notify_cancel()
+        ]
+        if not jobs:
+            return
         
+        try:
+            for (text, rate, volume, _), output_path in jobs:
+                self.tts_engine.setProperty('rate', rate)
+                self.tts_engine.setProperty('volume', volume)
+                self.tts_engine.save_to_file(text, output_path)
+            
+            self.tts_engine.runAndWait()
+            
         except Exception as e:
             logger.error(f"Speech synthesis failed: {e}")
-            return {'error': str(e)}
+            for (_, _, _, future), output_path in jobs:
+                self._remove_tts_output(output_path)
+                future.set_result({'error': str(e)})
+            return
+        
+        for (text, _, _, future), output_path in jobs:
+            future.set_result(self._read_tts_output(text, output_path))
+    
+    def _read_tts_output(self, text: str, output_path: str) -> Dict[str, Any]:
+        """Read a rendered utterance back as base64 and remove the file."""
+        try:
+            with open(output_path, 'rb') as audio_file:
+                audio_base64 = binascii.b2a_base64(audio_file.read(), newline=False).decode('ascii')
+            
+            logger.info(f"Speech synthesis successful for text: '{text[:50]}...'")
+            return {'audioData': audio_base64}
+            
+        except Exception as e:
+            logger.error(f"Failed to read synthesized audio: {e}")
+            return {'error': f'Failed to read audio file: {e}'}
+        
+        finally:
+            self._remove_tts_output(output_path)
+    
+    @staticmethod
+    def _remove_tts_output(output_path: str):
+        """Delete a rendered utterance, ignoring files that were never written."""
+        try:
+            os.unlink(output_path)
+        except OSError:
+            pass
+    
+    def _next_tts_output_path(self) -> str:
+        """Return a unique output path for the next synthesized utterance."""
+        return os.path.join(
+            self._tts_output_dir,
+            f"{next(self._tts_output_counter)}.wav"
+        )
     
     def process_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
         """Process a single request and return response."""
@@ -333,13 +1221,31 @@ class LocalSpeechService:
             if action == 'recognize':
                 audio_data = request.get('audioData', '')
                 config = request.get('config', {})
-                response = self.recognize_speech(audio_data, config)
+                audio_ref = request.get('audioRef')
+                response = self.recognize_speech(audio_data, config, audio_ref)
+                
+            elif action == 'prepare_audio':
+                response = self.prepare_audio()
                 
             elif action == 'synthesize':
                 text = request.get('text', '')
                 config = request.get('config', {})
                 response = self.synthesize_speech(text, config)
                 
+            elif action == 'stream_start':
+                config = request.get('config', {})
+                response = self.start_stream(config)
+                
+            elif action == 'stream_chunk':
+                stream_id = request.get('streamId', '')
+                audio_data = request.get('audioData', '')
+                final = bool(request.get('final', False))
+                response = self.recognize_stream_chunk(stream_id, audio_data, final)
+                
+            elif action == 'stream_end':
+                stream_id = request.get('streamId', '')
+                response = self.end_stream(stream_id)
+                
             elif action == 'configure':
                 new_config = request.get('config', {})
                 response = self.update_config(new_config)
@@ -368,35 +1274,295 @@ class LocalSpeechService:
         logger.info("Local speech service starting...")
         logger.info(f"Service ready: {self.is_ready}")
         
+        # PythonSpeechService.stop() sends SIGTERM; without a handler the
+        # process dies without running the cleanup in the finally block
+        signal.signal(signal.SIGTERM, _exit_on_sigterm)
+        
+        writer = threading.Thread(target=self._write_responses, name='stdout-writer', daemon=True)
+        writer.start()
+        
+        if self._audio_channel is not None:
+            threading.Thread(target=self._read_audio_frames, name='audio-channel-reader', daemon=True).start()
+        
         try:
-            for line in sys.stdin:
-                line = line.strip()
-                if not line:
-                    continue
-                
-                try:
-                    request = json.loads(line)
-                    response = self.process_request(request)
-                    
-                    # Send response to stdout
-                    print(json.dumps(response), flush=True)
-                    
-                except json.JSONDecodeError as e:
-                    logger.error(f"Invalid JSON request: {e}")
-                    error_response = {'error': 'Invalid JSON request'}
-                    print(json.dumps(error_response), flush=True)
-                
-                except Exception as e:
-                    logger.error(f"Unexpected error processing request: {e}")
-                    error_response = {'error': str(e)}
-                    print(json.dumps(error_response), flush=True)
+            if fcntl is not None:
+                self._serve_stdin_selector()
+            else:
+                self._serve_stdin_thread()
         
         except KeyboardInterrupt:
             logger.info("Service interrupted by user")
         except Exception as e:
             logger.error(f"Service crashed: {e}")
         finally:
+            # Drain in-flight requests and pending responses before exiting
+            self._executor.shutdown(wait=True)
+            self._drain_synthesis()
+            self._fail_audio_channel('Service stopping')
+            if self._tts_output_dir:
+                shutil.rmtree(self._tts_output_dir, ignore_errors=True)
+            self._response_queue.put(None)
+            writer.join()
             logger.info("Local speech service stopping...")
+            # Flush queued log records to stderr
+            self._log_listener.stop()
+    
+    def _serve_stdin_selector(self):
+        """
+        Read requests from non-blocking stdin until EOF.
+        
+        Lines are assembled from raw reads, and housekeeping runs between
+        reads even while the parent is idle or mid-way through a long line.
+        Stdin that cannot be polled (e.g. a regular file under epoll) is
+        served by the reader thread instead.
+        """
+        stdin_fd = sys.stdin.fileno()
+        
+        with selectors.DefaultSelector() as selector:
+            try:
+                selector.register(stdin_fd, selectors.EVENT_READ)
+            except OSError as e:
+                logger.info(f"Stdin cannot be polled ({e}), using reader thread")
+                self._serve_stdin_thread()
+                return
+            
+            original_flags = fcntl.fcntl(stdin_fd, fcntl.F_GETFL)
+            fcntl.fcntl(stdin_fd, fcntl.F_SETFL, original_flags | os.O_NONBLOCK)
+            
+            pending = bytearray()
+            next_housekeeping = time.monotonic() + HOUSEKEEPING_INTERVAL
+            
+            try:
+                while True:
+                    if selector.select(timeout=HOUSEKEEPING_INTERVAL):
+                        try:
+                            data = os.read(stdin_fd, STDIN_READ_SIZE)
+                        except BlockingIOError:
+                            data = None
+                        
+                        if data == b'':
+                            break
+                        
+                        if data:
+                            # Only the newly read bytes can contain a new line end
+                            search_from = len(pending)
+                            pending += data
+                            start = 0
+                            end = pending.find(b'\n', search_from)
+                            while end != -1:
+                                line = bytes(pending[start:end]).strip()
+                                if line:
+                                    self._handle_line(line)
+                                start = end + 1
+                                end = pending.find(b'\n', start)
+                            del pending[:start]
+                    
+                    now = time.monotonic()
+                    if now >= next_housekeeping:
+                        self._run_housekeeping(now)
+                        next_housekeeping = now + HOUSEKEEPING_INTERVAL
+                
+                # A final request without a trailing newline
+                line = bytes(pending).strip()
+                if line:
+                    self._handle_line(line)
+            
+            finally:
+                fcntl.fcntl(stdin_fd, fcntl.F_SETFL, original_flags)
+    
+    def _serve_stdin_thread(self):
+        """Read requests through a blocking reader thread until EOF."""
+        reader = threading.Thread(target=self._read_requests, name='stdin-reader', daemon=True)
+        reader.start()
+        
+        while True:
+            try:
+                line = self._request_queue.get(timeout=HOUSEKEEPING_INTERVAL)
+            except queue.Empty:
+                self._run_housekeeping(time.monotonic())
+                continue
+            
+            if line is None:
+                break
+            
+            self._handle_line(line)
+    
+    def _run_housekeeping(self, now: float):
+        """Discard idle recognition streams and unclaimed side-channel audio."""
+        with self._streams_lock:
+            idle_streams = [
+                stream_id for stream_id, stream in self._streams.items()
+                if now - stream.last_activity > STREAM_IDLE_TIMEOUT
+            ]
+            for stream_id in idle_streams:
+                del self._streams[stream_id]
+        
+        for stream_id in idle_streams:
+            logger.warning(f"Recognition stream {stream_id} expired after inactivity")
+        
+        with self._audio_refs_lock:
+            stale_refs = [
+                audio_ref for audio_ref, (created, _) in self._audio_refs.items()
+                if now - created > AUDIO_REF_TTL
+            ]
+            for audio_ref in stale_refs:
+                del self._audio_refs[audio_ref]
+        
+        self._expire_synthesis(now)
+        self._expire_prepare_waiters(now)
+    
+    def _handle_line(self, line: bytes):
+        """Parse one request line, process it and queue the response."""
+        try:
+            request = _loads(line)
+            
+            if request.get('action') == 'synthesize':
+                self._dispatch_synthesis(request)
+            elif request.get('action') == 'prepare_audio':
+                # Resolved by the audio channel reader once the frame arrives
+                future = self.prepare_audio_async()
+                future.add_done_callback(
+                    functools.partial(self._on_prepare_done, request.get('requestId'))
+                )
+            elif request.get('action') in POOLED_ACTIONS:
+                # Responses are correlated by requestId, so they may
+                # complete out of order
+                future = self._executor.submit(self.process_request, request)
+                future.add_done_callback(self._on_request_done)
+            else:
+                self._send_response(self.process_request(request))
+            
+        except json.JSONDecodeError as e:
+            logger.error(f"Invalid JSON request: {e}")
+            self._send_response({'error': 'Invalid JSON request'})
+        
+        except Exception as e:
+            logger.error(f"Unexpected error processing request: {e}")
+            self._send_response({'error': str(e)})
+    
+    def _on_request_done(self, future: Future):
+        """Send the response of a request completed on the worker pool."""
+        try:
+            self._send_response(future.result())
+        except Exception as e:
+            logger.error(f"Unexpected error processing request: {e}")
+            self._send_response({'error': str(e)})
+    
+    def _on_prepare_done(self, request_id: Any, future: Future):
+        """Send the response of a prepare_audio request once its frame is paired."""
+        response = dict(future.result())
+        if request_id:
+            response['requestId'] = request_id
+        self._send_response(response)
+    
+    def _dispatch_synthesis(self, request: Dict[str, Any]):
+        """Queue a synthesize request; the TTS worker resolves it, no pool thread waits."""
+        try:
+            future = self.synthesize_speech_async(
+                request.get('text', ''),
+                request.get('config', {})
+            )
+        except Exception as e:
+            logger.error(f"Speech synthesis failed: {e}")
+            future = self._resolved_future({'error': str(e)})
+        
+        with self._synthesis_lock:
+            self._pending_synthesis[future] = (
+                time.monotonic() + TTS_RESULT_TIMEOUT,
+                request.get('requestId')
+            )
+        future.add_done_callback(
+            functools.partial(self._on_synthesis_done, request.get('requestId'))
+        )
+    
+    def _on_synthesis_done(self, request_id: Any, future: Future):
+        """Send the response of a synthesis resolved by the TTS worker."""
+        with self._synthesis_lock:
+            if self._pending_synthesis.pop(future, None) is None:
+                # Already answered with a timeout
+                return
+            
+            if future.cancelled():
+                response = {'error': 'Speech synthesis cancelled'}
+            else:
+                response = dict(future.result())
+            
+            if request_id:
+                response['requestId'] = request_id
+            self._send_response(response)
+            self._synthesis_lock.notify_all()
+    
+    def _expire_synthesis(self, now: float):
+        """Answer synthesis requests the TTS worker has not finished by their deadline."""
+        with self._synthesis_lock:
+            expired = [
+                future for future, (deadline, _) in self._pending_synthesis.items()
+                if deadline <= now
+            ]
+            for future in expired:
+                _, request_id = self._pending_synthesis.pop(future)
+                future.cancel()
+                logger.error("Speech synthesis timed out")
+                
+                response = {'error': 'Speech synthesis timed out'}
+                if request_id:
+                    response['requestId'] = request_id
+                self._send_response(response)
+    
+    def _drain_synthesis(self):
+        """Wait for pending synthesis until its deadlines, then time out the rest."""
+        with self._synthesis_lock:
+            if self._pending_synthesis:
+                last_deadline = max(deadline for deadline, _ in self._pending_synthesis.values())
+                self._synthesis_lock.wait_for(
+                    lambda: not self._pending_synthesis,
+                    timeout=max(0.0, last_deadline - time.monotonic())
+                )
+        
+        self._expire_synthesis(math.inf)
+    
+    def _send_response(self, response: Dict[str, Any]):
+        """Serialize a response and hand it to the stdout writer thread."""
+        self._response_queue.put(_dumps(response))
+    
+    def _read_requests(self):
+        """Feed non-empty stdin lines to the request queue until EOF."""
+        try:
+            # A private reader on the fd, not sys.stdin.buffer: interpreter
+            # shutdown (e.g. on SIGTERM) aborts if this daemon thread is
+            # blocked holding the sys.stdin buffer lock
+            with open(sys.stdin.fileno(), 'rb', closefd=False) as stdin:
+                for line in stdin:
+                    line = line.strip()
+                    if line:
+                        self._request_queue.put(line)
+        except Exception as e:
+            logger.error(f"Failed to read requests: {e}")
+        finally:
+            self._request_queue.put(None)
+    
+    def _write_responses(self):
+        """Write queued responses to stdout as newline-delimited JSON."""
+        out = sys.stdout.buffer
+        while True:
+            data = self._response_queue.get()
+            if data is None:
+                break
+            
+            out.write(data)
+            
+            # Coalesce responses that are already waiting into one flush
+            try:
+                while True:
+                    data = self._response_queue.get_nowait()
+                    if data is None:
+                        out.flush()
+                        return
+                    out.write(data)
+            except queue.Empty:
+                pass
+            
+            out.flush()
 
 def main():
     """Main entry point."""
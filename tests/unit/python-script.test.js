@@ -4,6 +4,8 @@
  */
 
 const { spawn } = require('child_process');
+const fs = require('fs');
+const os = require('os');
 const path = require('path');
 
 describe('Python Speech Service Script', () => {
@@ -209,6 +211,41 @@ describe('Python Speech Service Script', () => {
         setTimeout(() => reject(new Error('Recognition request timeout')), 10000);
       });
     });
+
+    test('should reject oversized audio before decoding it', async () => {
+      return new Promise((resolve, reject) => {
+        // Decodes to just over MAX_AUDIO_BYTES (30 s of 48 kHz stereo int16)
+        const recognizeRequest = JSON.stringify({
+          action: 'recognize',
+          requestId: 'recognize-large',
+          audioData: 'A'.repeat(7680004),
+          config: {
+            language: 'en-US'
+          }
+        }) + '\n';
+
+        pythonProcess.stdout.once('data', (data) => {
+          try {
+            const response = JSON.parse(data.toString().trim());
+            
+            expect(response).toEqual({
+              requestId: 'recognize-large',
+              transcript: '',
+              confidence: 0.0,
+              error: 'Audio too large'
+            });
+            
+            resolve();
+          } catch (error) {
+            reject(error);
+          }
+        });
+
+        pythonProcess.stdin.write(recognizeRequest);
+
+        setTimeout(() => reject(new Error('Recognition request timeout')), 10000);
+      });
+    }, 15000);
   });
 
   describe('Text-to-Speech Tests', () => {
@@ -256,6 +293,35 @@ describe('Python Speech Service Script', () => {
       });
     });
 
+    test('should return synthesis errors with the request id', async () => {
+      return new Promise((resolve, reject) => {
+        const synthesizeRequest = JSON.stringify({
+          action: 'synthesize',
+          requestId: 'tts-invalid',
+          text: 5
+        }) + '\n';
+
+        pythonProcess.stdout.once('data', (data) => {
+          try {
+            const response = JSON.parse(data.toString().trim());
+            
+            expect(response).toEqual({
+              requestId: 'tts-invalid',
+              error: expect.any(String)
+            });
+            
+            resolve();
+          } catch (error) {
+            reject(error);
+          }
+        });
+
+        pythonProcess.stdin.write(synthesizeRequest);
+
+        setTimeout(() => reject(new Error('TTS request timeout')), 5000);
+      });
+    });
+
     test('should handle valid text synthesis (if TTS engine available)', async () => {
       return new Promise((resolve, reject) => {
         const synthesizeRequest = JSON.stringify({
@@ -295,6 +361,201 @@ describe('Python Speech Service Script', () => {
         setTimeout(() => reject(new Error('TTS valid request timeout')), 10000);
       });
     });
+
+    test('should serve repeated synthesis from the cache', async () => {
+      return new Promise((resolve, reject) => {
+        const synthesizeRequest = (requestId) => JSON.stringify({
+          action: 'synthesize',
+          requestId,
+          text: 'Cache this sentence.',
+          config: {
+            voice_rate: 150,
+            voice_volume: 0.8
+          }
+        }) + '\n';
+
+        pythonProcess.stdout.once('data', (data) => {
+          try {
+            const first = JSON.parse(data.toString().trim());
+            
+            expect(first.requestId).toBe('tts-cache-1');
+            expect(first).not.toHaveProperty('cached');
+            
+            if (first.error) {
+              // Nothing is cached when TTS is not available
+              resolve();
+              return;
+            }
+            
+            pythonProcess.stdout.once('data', (repeatData) => {
+              try {
+                const second = JSON.parse(repeatData.toString().trim());
+                
+                expect(second).toEqual({
+                  requestId: 'tts-cache-2',
+                  audioData: first.audioData,
+                  cached: true
+                });
+                
+                resolve();
+              } catch (error) {
+                reject(error);
+              }
+            });
+            
+            pythonProcess.stdin.write(synthesizeRequest('tts-cache-2'));
+          } catch (error) {
+            reject(error);
+          }
+        });
+
+        pythonProcess.stdin.write(synthesizeRequest('tts-cache-1'));
+
+        setTimeout(() => reject(new Error('TTS cache request timeout')), 10000);
+      });
+    });
+  });
+
+  describe('Streaming Recognition Tests', () => {
+    beforeEach(async () => {
+      return new Promise((resolve, reject) => {
+        pythonProcess = spawn('python3', [scriptPath], {
+          stdio: ['pipe', 'pipe', 'pipe']
+        });
+
+        pythonProcess.on('error', reject);
+        setTimeout(resolve, 1000);
+      });
+    });
+
+    test('should open a recognition stream and return its id', async () => {
+      return new Promise((resolve, reject) => {
+        const startRequest = JSON.stringify({
+          action: 'stream_start',
+          requestId: 'stream-start-test',
+          config: {
+            language: 'en-US'
+          }
+        }) + '\n';
+
+        pythonProcess.stdout.once('data', (data) => {
+          try {
+            const response = JSON.parse(data.toString().trim());
+            
+            expect(response).toEqual({
+              requestId: 'stream-start-test',
+              streamId: expect.any(String)
+            });
+            
+            resolve();
+          } catch (error) {
+            reject(error);
+          }
+        });
+
+        pythonProcess.stdin.write(startRequest);
+
+        setTimeout(() => reject(new Error('Stream start request timeout')), 5000);
+      });
+    });
+
+    test('should reject chunks for unknown streams', async () => {
+      return new Promise((resolve, reject) => {
+        const chunkRequest = JSON.stringify({
+          action: 'stream_chunk',
+          requestId: 'stream-chunk-test',
+          streamId: 'missing-stream',
+          audioData: ''
+        }) + '\n';
+
+        pythonProcess.stdout.once('data', (data) => {
+          try {
+            const response = JSON.parse(data.toString().trim());
+            
+            expect(response).toEqual({
+              requestId: 'stream-chunk-test',
+              error: 'Unknown stream: missing-stream'
+            });
+            
+            resolve();
+          } catch (error) {
+            reject(error);
+          }
+        });
+
+        pythonProcess.stdin.write(chunkRequest);
+
+        setTimeout(() => reject(new Error('Stream chunk request timeout')), 5000);
+      });
+    });
+  });
+
+  describe('Google Recognition Confidence', () => {
+    // Runs LocalSpeechService._recognize_google against a canned show_all
+    // result and returns its [transcript, confidence] pair
+    const recognizeGoogle = (result) => new Promise((resolve, reject) => {
+      const code = [
+        'import json',
+        'import local_speech_service as m',
+        'class Recognizer:',
+        '    def recognize_google(self, audio, language="en-US", show_all=False):',
+        `        return json.loads(${JSON.stringify(JSON.stringify(result))})`,
+        'service = m.LocalSpeechService()',
+        'service.recognizer = Recognizer()',
+        'try:',
+        '    print(json.dumps(service._recognize_google(None, "en-US")))',
+        'except m.sr.UnknownValueError:',
+        '    print(json.dumps("UnknownValueError"))'
+      ].join('\n');
+
+      pythonProcess = spawn('python3', ['-c', code], {
+        cwd: path.dirname(scriptPath),
+        stdio: ['pipe', 'pipe', 'pipe']
+      });
+
+      let stdoutData = '';
+      pythonProcess.stdout.on('data', (data) => {
+        stdoutData += data.toString();
+      });
+
+      pythonProcess.on('error', reject);
+      pythonProcess.on('exit', (code) => {
+        try {
+          resolve(JSON.parse(stdoutData.trim()));
+        } catch (error) {
+          reject(new Error(`Python exited with code ${code}: ${stdoutData}`));
+        }
+      });
+
+      setTimeout(() => reject(new Error('Google recognition timeout')), 10000);
+    });
+
+    test('should pick the alternative with the highest confidence', async () => {
+      const response = await recognizeGoogle({
+        alternative: [
+          { transcript: 'hello word' },
+          { transcript: 'hello world', confidence: 0.92 }
+        ],
+        final: true
+      });
+
+      expect(response).toEqual(['hello world', 0.92]);
+    });
+
+    test('should estimate confidence when Google omits it', async () => {
+      const response = await recognizeGoogle({
+        alternative: [{ transcript: 'a'.repeat(50) }],
+        final: true
+      });
+
+      expect(response).toEqual(['a'.repeat(50), 0.5]);
+    });
+
+    test('should treat an empty result as unrecognized speech', async () => {
+      const response = await recognizeGoogle([]);
+
+      expect(response).toBe('UnknownValueError');
+    });
   });
 
   describe('Error Handling', () => {
@@ -362,6 +623,154 @@ describe('Python Speech Service Script', () => {
     });
   });
 
+  describe('Audio Side Channel', () => {
+    beforeEach(async () => {
+      return new Promise((resolve, reject) => {
+        pythonProcess = spawn('python3', [scriptPath], {
+          stdio: ['pipe', 'pipe', 'pipe', 'pipe'],
+          env: { ...process.env, SPEECH_AUDIO_FD: '3' }
+        });
+
+        pythonProcess.on('error', reject);
+        setTimeout(resolve, 1000);
+      });
+    });
+
+    test('should answer other requests while waiting for an audio frame', async () => {
+      return new Promise((resolve, reject) => {
+        pythonProcess.stdout.once('data', (data) => {
+          try {
+            const response = JSON.parse(data.toString().trim().split('\n')[0]);
+            
+            expect(response).toHaveProperty('requestId', 'channel-status');
+            
+            resolve();
+          } catch (error) {
+            reject(error);
+          }
+        });
+
+        // No frame is written for this request
+        pythonProcess.stdin.write(JSON.stringify({
+          action: 'prepare_audio',
+          requestId: 'channel-prepare'
+        }) + '\n');
+        pythonProcess.stdin.write(JSON.stringify({
+          action: 'status',
+          requestId: 'channel-status'
+        }) + '\n');
+
+        setTimeout(() => reject(new Error('Status request timeout')), 2000);
+      });
+    });
+
+    test('should pair a frame with its prepare_audio request', async () => {
+      return new Promise((resolve, reject) => {
+        pythonProcess.stdout.once('data', (data) => {
+          try {
+            const response = JSON.parse(data.toString().trim());
+            
+            expect(response).toEqual({
+              requestId: 'channel-frame',
+              audioRef: expect.any(String)
+            });
+            
+            resolve();
+          } catch (error) {
+            reject(error);
+          }
+        });
+
+        const audio = Buffer.from('mock audio data');
+        const header = Buffer.alloc(4);
+        header.writeUInt32BE(audio.length, 0);
+        pythonProcess.stdin.write(JSON.stringify({
+          action: 'prepare_audio',
+          requestId: 'channel-frame'
+        }) + '\n');
+        pythonProcess.stdio[3].write(Buffer.concat([header, audio]));
+
+        setTimeout(() => reject(new Error('Prepare audio timeout')), 5000);
+      });
+    });
+  });
+
+  describe('Stdin Handling', () => {
+    test('should handle a request line split across writes', async () => {
+      return new Promise((resolve, reject) => {
+        pythonProcess = spawn('python3', [scriptPath], {
+          stdio: ['pipe', 'pipe', 'pipe']
+        });
+
+        const request = JSON.stringify({
+          action: 'status',
+          requestId: 'split-test'
+        }) + '\n';
+
+        pythonProcess.stdout.once('data', (data) => {
+          try {
+            const response = JSON.parse(data.toString().trim());
+            
+            expect(response).toHaveProperty('requestId', 'split-test');
+            expect(response).toHaveProperty('isReady');
+            
+            resolve();
+          } catch (error) {
+            reject(error);
+          }
+        });
+
+        pythonProcess.on('error', reject);
+
+        pythonProcess.stdin.write(request.slice(0, 15));
+        setTimeout(() => pythonProcess.stdin.write(request.slice(15)), 200);
+
+        setTimeout(() => reject(new Error('Split request timeout')), 10000);
+      });
+    }, 15000);
+
+    test('should serve requests from file-backed stdin', async () => {
+      const requestFile = path.join(os.tmpdir(), `speech-requests-${process.pid}.jsonl`);
+      fs.writeFileSync(requestFile, [
+        JSON.stringify({ action: 'status', requestId: 'file-1' }),
+        JSON.stringify({ action: 'status', requestId: 'file-2' })
+      ].join('\n') + '\n');
+      const requestFd = fs.openSync(requestFile, 'r');
+
+      try {
+        await new Promise((resolve, reject) => {
+          pythonProcess = spawn('python3', [scriptPath], {
+            stdio: [requestFd, 'pipe', 'pipe']
+          });
+
+          let stdoutData = '';
+          pythonProcess.stdout.on('data', (data) => {
+            stdoutData += data.toString();
+          });
+
+          pythonProcess.on('error', reject);
+
+          pythonProcess.on('exit', () => {
+            try {
+              const responses = stdoutData.trim().split('\n').map(line => JSON.parse(line));
+              
+              expect(responses.map(response => response.requestId)).toEqual(['file-1', 'file-2']);
+              
+              resolve();
+            } catch (error) {
+              reject(error);
+            }
+          });
+
+          setTimeout(() => reject(new Error('File-backed stdin timeout')), 10000);
+        });
+      } finally {
+        fs.closeSync(requestFd);
+        fs.unlinkSync(requestFile);
+      }
+    }, 15000);
+  });
+
   describe('Multiple Requests', () => {
     beforeEach(async () => {
       return new Promise((resolve, reject) => {
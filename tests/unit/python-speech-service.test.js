@@ -106,6 +106,165 @@ describe('Python Speech Service Integration', () => {
       expect(result).toEqual(expectedResponse);
     });
 
+    test('should decode responses split inside a multi-byte character', async () => {
+      const audioBuffer = Buffer.from('mock audio data');
+      const expectedResponse = {
+        transcript: 'un café',
+        confidence: 0.9,
+        language: 'fr-FR'
+      };
+
+      setTimeout(() => {
+        const dataCallback = mockPythonProcess.stdout.on.mock.calls.find(
+          call => call[0] === 'data'
+        )[1];
+        const response = Buffer.from(JSON.stringify({ ...expectedResponse, requestId: 1 }) + '\n');
+        // Split between the two bytes of the UTF-8 encoded 'é'
+        const splitAt = response.indexOf(Buffer.from('é')) + 1;
+        dataCallback(response.subarray(0, splitAt));
+        dataCallback(response.subarray(splitAt));
+      }, 10);
+
+      const result = await pythonService.recognizeSpeech(audioBuffer, {
+        language: 'fr-FR'
+      });
+
+      expect(result).toEqual(expectedResponse);
+    });
+
+    test('should send audio over the binary side channel when available', async () => {
+      const audioChannel = {
+        write: jest.fn((data, callback) => callback && callback()),
+        on: jest.fn()
+      };
+      mockPythonProcess.stdio = [null, null, null, audioChannel];
+      await pythonService.stop();
+      await pythonService.start();
+
+      const audioBuffer = Buffer.from('mock audio data');
+      const expectedResponse = {
+        transcript: 'hello world',
+        confidence: 0.95,
+        language: 'en-US'
+      };
+
+      const dataCallback = mockPythonProcess.stdout.on.mock.calls.filter(
+        call => call[0] === 'data'
+      ).pop()[1];
+      setTimeout(() => {
+        dataCallback(JSON.stringify({ audioRef: 'ref-1', requestId: 1 }) + '\n');
+        setTimeout(() => {
+          dataCallback(JSON.stringify({ ...expectedResponse, requestId: 2 }) + '\n');
+        }, 10);
+      }, 10);
+
+      const result = await pythonService.recognizeSpeech(audioBuffer);
+
+      const header = Buffer.alloc(4);
+      header.writeUInt32BE(audioBuffer.length, 0);
+      expect(audioChannel.write).toHaveBeenNthCalledWith(1, header);
+      expect(audioChannel.write).toHaveBeenNthCalledWith(2, audioBuffer, expect.any(Function));
+      expect(mockPythonProcess.stdin.write).toHaveBeenCalledWith(
+        JSON.stringify({ action: 'prepare_audio', requestId: 1 }) + '\n'
+      );
+      expect(mockPythonProcess.stdin.write).toHaveBeenCalledWith(
+        JSON.stringify({
+          action: 'recognize',
+          audioRef: 'ref-1',
+          config: { language: 'en-US', timeout: 5000 },
+          requestId: 2
+        }) + '\n'
+      );
+      expect(result).toEqual(expectedResponse);
+    });
+
+    test('should fall back to base64 audio when the side channel fails', async () => {
+      const audioChannel = {
+        write: jest.fn((data, callback) => callback && callback()),
+        on: jest.fn()
+      };
+      mockPythonProcess.stdio = [null, null, null, audioChannel];
+      await pythonService.stop();
+      await pythonService.start();
+
+      const audioBuffer = Buffer.from('mock audio data');
+      const expectedResponse = {
+        transcript: 'hello world',
+        confidence: 0.95,
+        language: 'en-US'
+      };
+
+      const dataCallback = mockPythonProcess.stdout.on.mock.calls.filter(
+        call => call[0] === 'data'
+      ).pop()[1];
+      setTimeout(() => {
+        dataCallback(JSON.stringify({ error: 'Audio channel not available', requestId: 1 }) + '\n');
+        setTimeout(() => {
+          dataCallback(JSON.stringify({ ...expectedResponse, requestId: 2 }) + '\n');
+        }, 10);
+      }, 10);
+
+      const result = await pythonService.recognizeSpeech(audioBuffer);
+
+      expect(mockPythonProcess.stdin.write).toHaveBeenCalledWith(
+        JSON.stringify({
+          action: 'recognize',
+          audioData: audioBuffer.toString('base64'),
+          config: { language: 'en-US', timeout: 5000 },
+          requestId: 2
+        }) + '\n'
+      );
+      expect(result).toEqual(expectedResponse);
+      expect(pythonService.audioChannel).toBeNull();
+    });
+
+    test('should resend audio as base64 when its reference has expired', async () => {
+      const audioChannel = {
+        write: jest.fn((data, callback) => callback && callback()),
+        on: jest.fn()
+      };
+      mockPythonProcess.stdio = [null, null, null, audioChannel];
+      await pythonService.stop();
+      await pythonService.start();
+
+      const audioBuffer = Buffer.from('mock audio data');
+      const expectedResponse = {
+        transcript: 'hello world',
+        confidence: 0.95,
+        language: 'en-US'
+      };
+
+      const dataCallback = mockPythonProcess.stdout.on.mock.calls.filter(
+        call => call[0] === 'data'
+      ).pop()[1];
+      setTimeout(() => {
+        dataCallback(JSON.stringify({ audioRef: 'ref-1', requestId: 1 }) + '\n');
+        setTimeout(() => {
+          dataCallback(JSON.stringify({
+            transcript: '',
+            confidence: 0.0,
+            error: 'Unknown audio reference: ref-1',
+            requestId: 2
+          }) + '\n');
+          setTimeout(() => {
+            dataCallback(JSON.stringify({ ...expectedResponse, requestId: 3 }) + '\n');
+          }, 10);
+        }, 10);
+      }, 10);
+
+      const result = await pythonService.recognizeSpeech(audioBuffer);
+
+      expect(mockPythonProcess.stdin.write).toHaveBeenCalledWith(
+        JSON.stringify({
+          action: 'recognize',
+          audioData: audioBuffer.toString('base64'),
+          config: { language: 'en-US', timeout: 5000 },
+          requestId: 3
+        }) + '\n'
+      );
+      expect(result).toEqual(expectedResponse);
+    });
+
     test('should handle recognition timeouts', async () => {
       const audioBuffer = Buffer.from('mock audio data');
       
@@ -179,6 +338,24 @@ describe('Python Speech Service Integration', () => {
       expect(result.toString('base64')).toBe(expectedAudioData);
     });
 
+    test('should reassemble responses split across stdout chunks', async () => {
+      const text = 'Hello, this is a test message';
+      const expectedAudioData = Buffer.from('audio data for test').toString('base64');
+
+      setTimeout(() => {
+        const dataCallback = mockPythonProcess.stdout.on.mock.calls.find(
+          call => call[0] === 'data'
+        )[1];
+        const response = JSON.stringify({ audioData: expectedAudioData, requestId: 1 }) + '\n';
+        dataCallback(response.slice(0, 10));
+        dataCallback(response.slice(10));
+      }, 10);
+
+      const result = await pythonService.synthesizeSpeech(text);
+
+      expect(result.toString('base64')).toBe(expectedAudioData);
+    });
+
     test('should handle synthesis errors', async () => {
       const text = '';
       const errorResponse = { error: 'Text cannot be empty' };
@@ -196,6 +373,61 @@ describe('Python Speech Service Integration', () => {
     });
   });
 
+  describe('Streaming Recognition Communication', () => {
+    beforeEach(async () => {
+      await pythonService.start();
+    });
+
+    test('should open a recognition stream and return its id', async () => {
+      setTimeout(() => {
+        const dataCallback = mockPythonProcess.stdout.on.mock.calls.find(
+          call => call[0] === 'data'
+        )[1];
+        dataCallback(JSON.stringify({ streamId: 'stream-1', requestId: 1 }) + '\n');
+      }, 10);
+
+      const streamId = await pythonService.startRecognitionStream({ language: 'en-US' });
+
+      expect(mockPythonProcess.stdin.write).toHaveBeenCalledWith(
+        JSON.stringify({
+          action: 'stream_start',
+          config: { language: 'en-US' },
+          requestId: 1
+        }) + '\n'
+      );
+      expect(streamId).toBe('stream-1');
+    });
+
+    test('should send audio chunks and return partial transcripts', async () => {
+      const pcmBuffer = Buffer.from('mock pcm chunk');
+      const expectedResponse = {
+        streamId: 'stream-1',
+        transcript: 'hello',
+        final: false
+      };
+
+      setTimeout(() => {
+        const dataCallback = mockPythonProcess.stdout.on.mock.calls.find(
+          call => call[0] === 'data'
+        )[1];
+        dataCallback(JSON.stringify({ ...expectedResponse, requestId: 1 }) + '\n');
+      }, 10);
+
+      const result = await pythonService.sendRecognitionChunk('stream-1', pcmBuffer);
+
+      expect(mockPythonProcess.stdin.write).toHaveBeenCalledWith(
+        JSON.stringify({
+          action: 'stream_chunk',
+          streamId: 'stream-1',
+          audioData: pcmBuffer.toString('base64'),
+          final: false,
+          requestId: 1
+        }) + '\n'
+      );
+      expect(result).toEqual(expectedResponse);
+    });
+  });
+
   describe('Configuration Management', () => {
     test.skip('should update Python service configuration', async () => {
       // Skip - complex configuration mocking has timing issues